@@ -1,6 +1,22 @@
+from __future__ import annotations
+
 import json
 import random
-from typing import List, Dict, Any, Tuple
+import sys
+from collections import defaultdict
+from typing import List, Dict, Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library parser
+    orjson = None
+
+# Comprehensive descriptions of each category
+CATEGORY_DESCRIPTIONS = {
+    "Communication Failures": "Communication failures occur when information exchange between multiple LLM agents is impaired. These failures can result from information withholding, miscommunication, verbosity issues, incomplete exchanges, or signal distortion. They represent fundamental challenges in the transmission and reception of information between autonomous agents.",
+    "Alignment Failures": "Alignment failures emerge when the goals, values, or world models of multiple agents are not properly synchronized. These include inter-agent misalignment, divergent objectives, conflicting prioritization, inconsistent world models, and value misalignment. Such failures represent deeper architectural and design challenges in multi-agent systems.",
+    "Decision/Coordination Failures": "Decision and coordination failures manifest when multiple agents cannot effectively reach consensus or coordinate their actions. These include decision paralysis, fragmented consensus, resource misallocation, and coordination overhead. These failures reveal limitations in the collective decision-making capabilities of multi-agent systems."
+}
 
 class MultiAgentFailureEducator:
     """An AI agent designed to educate users about why multi-agent LLM systems fail.
@@ -14,6 +30,34 @@ class MultiAgentFailureEducator:
         """Initialize the Multi-Agent Failure Educator with the complete taxonomy."""
         self.failure_modes = self._load_failure_modes()
         self.categories = self._organize_categories()
+        self._rng = random.Random()
+        self._index_failure_modes()
+        
+        # Requests are matched case-insensitively against casefolded names
+        self._modes_folded = {mode_name.casefold(): mode_name for mode_name in self._names}
+        # Category phrases, in the order they are checked
+        self._category_phrases = {}
+        for category in self.categories:
+            category_folded = category.casefold()
+            self._category_phrases[f"explain {category_folded}"] = category
+            self._category_phrases[f"about {category_folded}"] = category
+        
+        # General phrases recognized in user requests, in the order they are checked
+        self._global_phrases = {
+            "list all failure modes": self._generate_all_failure_modes_response,
+            "show all failures": self._generate_all_failure_modes_response,
+            "list all categories": self._generate_all_categories_response,
+            "show all categories": self._generate_all_categories_response,
+        }
+        
+        # The taxonomy never changes after loading, so responses that do not
+        # include a demonstration are built once up front
+        self._category_responses = {
+            category: self._build_category_response(category) for category in self.categories
+        }
+        self._all_failure_modes_response = self._build_all_failure_modes_response()
+        self._all_categories_response = self._build_all_categories_response()
+        self._help_response = self._build_help_response()
         
     def _load_failure_modes(self) -> Dict[str, Dict[str, Any]]:
         """Load failure modes from the database file.
@@ -22,13 +66,28 @@ class MultiAgentFailureEducator:
             Dictionary mapping failure mode names to their complete data.
         """
         try:
-            with open('data/failure_modes.json', 'r') as f:
-                return json.load(f)
+            failure_modes = self._parse_failure_modes()
+            
+            # Every mode repeats one of a few category names; interning them
+            # leaves a single string object per category
+            for mode_data in failure_modes.values():
+                category = mode_data.get('category')
+                if isinstance(category, str):
+                    mode_data['category'] = sys.intern(category)
+            return failure_modes
         except Exception as e:
             print(f"Error loading failure modes: {e}")
             print("Warning: Failure modes database not found. Using default data.")
             return self._create_default_failure_modes()
     
+    def _parse_failure_modes(self) -> Dict[str, Dict[str, Any]]:
+        """Parse the failure modes JSON file."""
+        if orjson is not None:
+            with open('data/failure_modes.json', 'rb') as f:
+                return orjson.loads(f.read())
+        with open('data/failure_modes.json', 'r') as f:
+            return json.load(f)
+    
     def _create_default_failure_modes(self) -> Dict[str, Dict[str, Any]]:
         """Create default failure modes data if the database file is not found."""
         # This will be populated with the MASFT taxonomy data
@@ -40,13 +99,42 @@ class MultiAgentFailureEducator:
         Returns:
             Dictionary mapping category names to lists of failure mode names.
         """
-        categories = {}
+        categories = defaultdict(list)
         for mode_name, mode_data in self.failure_modes.items():
-            category = mode_data.get('category')
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(mode_name)
-        return categories
+            categories[mode_data.get('category')].append(mode_name)
+        return dict(categories)
+    
+    def _index_failure_modes(self):
+        """Lay out the per-mode fields used on hot paths as parallel lists.
+        
+        Each failure mode gets a dense integer ID (its position in the taxonomy),
+        and every list below is indexed by that ID, so lookups avoid walking
+        the nested failure mode dictionaries. Only the light fields are indexed;
+        the analysis and scenarios are read from the failure mode record when
+        a single mode is drilled into.
+        """
+        self._names = list(self.failure_modes)
+        self._name_to_id = {mode_name: mode_id for mode_id, mode_name in enumerate(self._names)}
+        
+        modes = list(self.failure_modes.values())
+        self._mode_categories = [mode_data.get('category') for mode_data in modes]
+        self._descriptions = [mode_data.get('description', 'No description available.') for mode_data in modes]
+        self._short_descriptions = [
+            mode_data.get('short_description', 'No description available.') for mode_data in modes
+        ]
+        # Start each mode at a random scenario so demonstrations differ between sessions
+        self._scenario_cursors = [
+            self._rng.randrange(max(len(mode_data.get('example_scenarios', [])), 1)) for mode_data in modes
+        ]
+        self._mode_response_prefixes = [None] * len(modes)
+        self._mode_response_suffixes = [None] * len(modes)
+        self._solutions = [
+            {
+                'tactical': mode_data.get('tactical_solutions', []),
+                'structural': mode_data.get('structural_solutions', [])
+            }
+            for mode_data in modes
+        ]
     
     def get_all_categories(self) -> List[str]:
         """Get all failure mode categories.
@@ -87,13 +175,15 @@ class MultiAgentFailureEducator:
         Returns:
             A string containing the demonstration scenario.
         """
-        mode_info = self.get_failure_mode_info(mode_name)
-        scenarios = mode_info.get('example_scenarios', [])
+        mode_id = self._name_to_id.get(mode_name)
+        scenarios = self.get_failure_mode_info(mode_name).get('example_scenarios', [])
         if not scenarios:
             return f"No demonstration scenarios available for {mode_name}."
         
-        # Select a random scenario to demonstrate
-        return random.choice(scenarios)
+        # Rotate through the scenarios so repeated demonstrations vary
+        index = self._scenario_cursors[mode_id]
+        self._scenario_cursors[mode_id] = (index + 1) % len(scenarios)
+        return scenarios[index]
     
     def analyze_failure_mode(self, mode_name: str) -> str:
         """Provide PhD-level analysis of why a specific failure mode occurs.
@@ -116,11 +206,10 @@ class MultiAgentFailureEducator:
         Returns:
             Dictionary containing tactical and structural solutions.
         """
-        mode_info = self.get_failure_mode_info(mode_name)
-        return {
-            'tactical': mode_info.get('tactical_solutions', []),
-            'structural': mode_info.get('structural_solutions', [])
-        }
+        mode_id = self._name_to_id.get(mode_name)
+        if mode_id is None:
+            return {'tactical': [], 'structural': []}
+        return self._solutions[mode_id]
     
     def explain_category(self, category: str) -> str:
         """Explain a failure mode category.
@@ -131,13 +220,7 @@ class MultiAgentFailureEducator:
         Returns:
             A string containing the category explanation.
         """
-        # Comprehensive descriptions of each category
-        category_descriptions = {
-            "Communication Failures": "Communication failures occur when information exchange between multiple LLM agents is impaired. These failures can result from information withholding, miscommunication, verbosity issues, incomplete exchanges, or signal distortion. They represent fundamental challenges in the transmission and reception of information between autonomous agents.",
-            "Alignment Failures": "Alignment failures emerge when the goals, values, or world models of multiple agents are not properly synchronized. These include inter-agent misalignment, divergent objectives, conflicting prioritization, inconsistent world models, and value misalignment. Such failures represent deeper architectural and design challenges in multi-agent systems.",
-            "Decision/Coordination Failures": "Decision and coordination failures manifest when multiple agents cannot effectively reach consensus or coordinate their actions. These include decision paralysis, fragmented consensus, resource misallocation, and coordination overhead. These failures reveal limitations in the collective decision-making capabilities of multi-agent systems."
-        }
-        return category_descriptions.get(category, f"No description available for {category}.")
+        return CATEGORY_DESCRIPTIONS.get(category, f"No description available for {category}.")
     
     def process_user_request(self, request: str) -> str:
         """Process a user request and generate a response.
@@ -151,91 +234,118 @@ class MultiAgentFailureEducator:
         # This is a simplified implementation for demonstration purposes
         # A real implementation would use NLP to understand the user's intent
         
-        request_lower = request.lower()
+        request_folded = request.casefold()
         
-        # Handle requests for specific failure modes
-        for mode_name in self.failure_modes.keys():
-            if mode_name.lower() in request_lower:
+        # Handle requests for specific failure modes; the first one in the
+        # taxonomy wins when several are mentioned
+        for mode_folded, mode_name in self._modes_folded.items():
+            if mode_folded in request_folded:
                 return self._generate_failure_mode_response(mode_name)
         
         # Handle requests for categories
-        for category in self.categories.keys():
-            if f"explain {category.lower()}" in request_lower or f"about {category.lower()}" in request_lower:
+        for phrase, category in self._category_phrases.items():
+            if phrase in request_folded:
                 return self._generate_category_response(category)
         
         # Handle general requests
-        if "list all failure modes" in request_lower or "show all failures" in request_lower:
-            return self._generate_all_failure_modes_response()
-        
-        if "list all categories" in request_lower or "show all categories" in request_lower:
-            return self._generate_all_categories_response()
+        for phrase, handler in self._global_phrases.items():
+            if phrase in request_folded:
+                return handler()
         
         # Default response
         return self._generate_help_response()
     
     def _generate_failure_mode_response(self, mode_name: str) -> str:
         """Generate a comprehensive response about a specific failure mode."""
-        mode_info = self.get_failure_mode_info(mode_name)
-        demonstration = self.demonstrate_failure_mode(mode_name)
-        analysis = self.analyze_failure_mode(mode_name)
-        solutions = self.get_solutions(mode_name)
-        
-        response = f"# {mode_name} (Category: {mode_info.get('category')})"
-        response += f"\n\n## Definition\n{mode_info.get('description', 'No description available.')}"
-        response += f"\n\n## Demonstration\n{demonstration}"
-        response += f"\n\n## PhD-Level Analysis\n{analysis}"
-        response += "\n\n## Solutions\n"
-        response += "\n### Tactical Solutions\n"
-        for solution in solutions.get('tactical', []):
-            response += f"- {solution}\n"
-        response += "\n### Structural Solutions\n"
-        for solution in solutions.get('structural', []):
-            response += f"- {solution}\n"
+        mode_id = self._name_to_id[mode_name]
+        if self._mode_response_prefixes[mode_id] is None:
+            self._build_failure_mode_response_parts(mode_id)
         
-        return response
+        return (
+            self._mode_response_prefixes[mode_id]
+            + self.demonstrate_failure_mode(mode_name)
+            + self._mode_response_suffixes[mode_id]
+        )
     
-    def _generate_category_response(self, category: str) -> str:
-        """Generate a comprehensive response about a failure mode category."""
-        explanation = self.explain_category(category)
-        modes = self.get_failure_modes_in_category(category)
+    def _build_failure_mode_response_parts(self, mode_id: int):
+        """Build the fixed text before and after a failure mode's demonstration.
         
-        response = f"# {category}\n\n{explanation}\n\n## Failure Modes in this Category:\n"
-        for mode in modes:
-            mode_info = self.get_failure_mode_info(mode)
-            response += f"- **{mode}**: {mode_info.get('short_description', 'No description available.')}\n"
+        Only the demonstration changes between responses about the same mode,
+        so the surrounding text is built the first time the mode is requested.
         
+        Args:
+            mode_id: The index of the failure mode in the taxonomy.
+        """
+        mode_name = self._names[mode_id]
+        solutions = self._solutions[mode_id]
+        
+        self._mode_response_prefixes[mode_id] = (
+            f"# {mode_name} (Category: {self._mode_categories[mode_id]})"
+            f"\n\n## Definition\n{self._descriptions[mode_id]}"
+            "\n\n## Demonstration\n"
+        )
+        
+        parts = [
+            f"\n\n## PhD-Level Analysis\n{self.analyze_failure_mode(mode_name)}",
+            "\n\n## Solutions\n",
+            "\n### Tactical Solutions\n",
+        ]
+        parts.extend(f"- {solution}\n" for solution in solutions.get('tactical', []))
+        parts.append("\n### Structural Solutions\n")
+        parts.extend(f"- {solution}\n" for solution in solutions.get('structural', []))
+        self._mode_response_suffixes[mode_id] = "".join(parts)
+    
+    def _generate_category_response(self, category: str) -> str:
+        """Generate a comprehensive response about a failure mode category."""
+        response = self._category_responses.get(category)
+        if response is None:
+            response = self._build_category_response(category)
         return response
     
     def _generate_all_failure_modes_response(self) -> str:
         """Generate a response listing all failure modes."""
-        response = "# All Failure Modes\n\n"
-        
-        for category, modes in self.categories.items():
-            response += f"## {category}\n"
-            for mode in modes:
-                mode_info = self.get_failure_mode_info(mode)
-                response += f"- **{mode}**: {mode_info.get('short_description', 'No description available.')}\n"
-            response += "\n"
-        
-        return response
+        return self._all_failure_modes_response
     
     def _generate_all_categories_response(self) -> str:
         """Generate a response listing all categories."""
-        response = "# All Failure Mode Categories\n\n"
-        
-        for category in self.categories.keys():
-            explanation = self.explain_category(category)
-            response += f"## {category}\n{explanation}\n\n"
-        
-        return response
+        return self._all_categories_response
     
     def _generate_help_response(self) -> str:
         """Generate a help response explaining how to use the agent."""
-        response = "# Multi-Agent Failure Educator Help\n\n"
-        response += "I can help you learn about why multi-agent LLM systems fail. Here are some things you can ask me:\n\n"
-        response += "- Ask about a specific failure mode (e.g., 'Show me an example of information withholding')\n"
-        response += "- Request explanation of a failure category (e.g., 'Explain inter-agent misalignment')\n"
-        response += "- Ask for solutions to a particular failure mode\n"
-        response += "- Request a list of all failure modes or categories\n"
-        
-        return response
+        return self._help_response
+    
+    def _build_category_response(self, category: str) -> str:
+        """Build the response about a failure mode category."""
+        parts = [f"# {category}\n\n{self.explain_category(category)}\n\n## Failure Modes in this Category:\n"]
+        parts.extend(
+            f"- **{mode}**: {self._short_descriptions[self._name_to_id[mode]]}\n"
+            for mode in self.get_failure_modes_in_category(category)
+        )
+        return "".join(parts)
+    
+    def _build_all_failure_modes_response(self) -> str:
+        """Build the response listing all failure modes."""
+        parts = ["# All Failure Modes\n\n"]
+        for category, modes in self.categories.items():
+            parts.append(f"## {category}\n")
+            parts.extend(f"- **{mode}**: {self._short_descriptions[self._name_to_id[mode]]}\n" for mode in modes)
+            parts.append("\n")
+        return "".join(parts)
+    
+    def _build_all_categories_response(self) -> str:
+        """Build the response listing all categories."""
+        parts = ["# All Failure Mode Categories\n\n"]
+        for category in self.categories.keys():
+            parts.append(f"## {category}\n{self.explain_category(category)}\n\n")
+        return "".join(parts)
+    
+    def _build_help_response(self) -> str:
+        """Build the help response explaining how to use the agent."""
+        return "".join([
+            "# Multi-Agent Failure Educator Help\n\n",
+            "I can help you learn about why multi-agent LLM systems fail. Here are some things you can ask me:\n\n",
+            "- Ask about a specific failure mode (e.g., 'Show me an example of information withholding')\n",
+            "- Request explanation of a failure category (e.g., 'Explain inter-agent misalignment')\n",
+            "- Ask for solutions to a particular failure mode\n",
+            "- Request a list of all failure modes or categories\n",
+        ])
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk
 from agent import MultiAgentFailureEducator
-from database import FailureEducatorDatabase
+from database import get_database
 
 class MultiAgentFailureEducatorApp:
     """GUI application for the Multi-Agent Failure Educator."""
@@ -18,14 +18,39 @@ class MultiAgentFailureEducatorApp:
         self.root.minsize(800, 600)
         
         self.agent = MultiAgentFailureEducator()
-        self.db = FailureEducatorDatabase()
+        # Log writes are committed by the database's background writer so
+        # that SQLite commits never block the Tk event loop
+        self.db = get_database(background_writes=True)
+        
+        # Failure modes per category for the dropdown, and the category whose
+        # modes it currently shows
+        self._modes_by_category = {
+            category: tuple(self.agent.get_failure_modes_in_category(category))
+            for category in self.agent.get_all_categories()
+        }
+        self._dropdown_category = None
         
         self._setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
     
     def __del__(self):
         """Clean up resources when the application is destroyed."""
-        if hasattr(self, 'db'):
+        self._close_db()
+    
+    def _on_close(self):
+        """Flush pending log entries and close the application."""
+        self._close_db()
+        self.root.destroy()
+    
+    def _close_db(self):
+        """Release the shared database exactly once.
+        
+        Each close() releases one get_database reference, so a second call
+        could close the connection under another holder.
+        """
+        if getattr(self, 'db', None) is not None:
             self.db.close()
+            self.db = None
     
     def _setup_ui(self):
         """Set up the user interface."""
@@ -313,6 +338,18 @@ class MultiAgentFailureEducatorApp:
         text_area.config(state=tk.DISABLED)
         return text_area
     
+    def _set_text(self, text_area, text):
+        """Replace the contents of a read-only text area with a single insert.
+        
+        Args:
+            text_area: The text widget to update.
+            text: The new contents.
+        """
+        text_area.config(state=tk.NORMAL)
+        text_area.delete(1.0, tk.END)
+        text_area.insert(tk.END, text)
+        text_area.config(state=tk.DISABLED)
+    
     def _process_query(self):
         """Process the user's query and display the response."""
         query = self.query_entry.get().strip()
@@ -326,10 +363,7 @@ class MultiAgentFailureEducatorApp:
         response = self.agent.process_user_request(query)
         
         # Display response
-        self.response_text.config(state=tk.NORMAL)
-        self.response_text.delete(1.0, tk.END)
-        self.response_text.insert(tk.END, response)
-        self.response_text.config(state=tk.DISABLED)
+        self._set_text(self.response_text, response)
         
         # Clear query entry
         self.query_entry.delete(0, tk.END)
@@ -361,10 +395,7 @@ class MultiAgentFailureEducatorApp:
         explanation = self.agent._generate_category_response(category)
         
         # Display explanation
-        self.category_details_text.config(state=tk.NORMAL)
-        self.category_details_text.delete(1.0, tk.END)
-        self.category_details_text.insert(tk.END, explanation)
-        self.category_details_text.config(state=tk.DISABLED)
+        self._set_text(self.category_details_text, explanation)
     
     def _on_category_dropdown_select(self, event):
         """Handle category selection in the dropdown.
@@ -377,19 +408,26 @@ class MultiAgentFailureEducatorApp:
     def _update_failure_mode_dropdown(self):
         """Update the failure mode dropdown based on the selected category."""
         category = self.category_var.get()
-        if not category:
+        if not category or category == self._dropdown_category:
             return
         
         # Get failure modes for the selected category
-        modes = self.agent.get_failure_modes_in_category(category)
+        modes = self._modes_by_category.get(category, ())
         
         # Update dropdown values
         self.mode_dropdown["values"] = modes
         if modes:
             self.mode_dropdown.current(0)
-            # Only call _on_failure_mode_select if we have valid modes and text widgets are created
-            if hasattr(self, 'description_text'):
-                self._on_failure_mode_select(None)
+        
+        # The text widgets don't exist yet during setup; leave the category
+        # unrecorded then, so selecting it later still fills the detail tabs
+        if not hasattr(self, 'description_text'):
+            return
+        self._dropdown_category = category
+        
+        # Only call _on_failure_mode_select if we have valid modes
+        if modes:
+            self._on_failure_mode_select(None)
     
     def _on_failure_mode_select(self, event):
         """Handle failure mode selection.
@@ -408,38 +446,23 @@ class MultiAgentFailureEducatorApp:
         mode_info = self.agent.get_failure_mode_info(mode)
         
         # Update description tab
-        self.description_text.config(state=tk.NORMAL)
-        self.description_text.delete(1.0, tk.END)
-        self.description_text.insert(tk.END, mode_info.get('description', 'No description available.'))
-        self.description_text.config(state=tk.DISABLED)
+        self._set_text(self.description_text, mode_info.get('description', 'No description available.'))
         
         # Update demonstration tab
-        self.demo_text.config(state=tk.NORMAL)
-        self.demo_text.delete(1.0, tk.END)
-        self.demo_text.insert(tk.END, self.agent.demonstrate_failure_mode(mode))
-        self.demo_text.config(state=tk.DISABLED)
+        self._set_text(self.demo_text, self.agent.demonstrate_failure_mode(mode))
         
         # Update analysis tab
-        self.analysis_text.config(state=tk.NORMAL)
-        self.analysis_text.delete(1.0, tk.END)
-        self.analysis_text.insert(tk.END, self.agent.analyze_failure_mode(mode))
-        self.analysis_text.config(state=tk.DISABLED)
+        self._set_text(self.analysis_text, self.agent.analyze_failure_mode(mode))
         
         # Update solutions tab
         solutions = self.agent.get_solutions(mode)
-        
-        self.solutions_text.config(state=tk.NORMAL)
-        self.solutions_text.delete(1.0, tk.END)
-        
-        self.solutions_text.insert(tk.END, "# Tactical Solutions\n\n")
-        for solution in solutions.get('tactical', []):
-            self.solutions_text.insert(tk.END, f"- {solution}\n")
-        
-        self.solutions_text.insert(tk.END, "\n# Structural Solutions\n\n")
-        for solution in solutions.get('structural', []):
-            self.solutions_text.insert(tk.END, f"- {solution}\n")
-        
-        self.solutions_text.config(state=tk.DISABLED)
+        solutions_text = "".join([
+            "# Tactical Solutions\n\n",
+            *(f"- {solution}\n" for solution in solutions.get('tactical', [])),
+            "\n# Structural Solutions\n\n",
+            *(f"- {solution}\n" for solution in solutions.get('structural', [])),
+        ])
+        self._set_text(self.solutions_text, solutions_text)
     
     def _update_stats(self):
         """Update the statistics display."""
@@ -451,23 +474,27 @@ class MultiAgentFailureEducatorApp:
         recent_queries = self.db.get_recent_queries(5)
         solution_stats = self.db.get_solution_feedback_stats()
         
-        # Display most viewed failure modes
-        self.stats_text.insert(tk.END, "Most Viewed Failure Modes:\n", "heading")
+        # Build the whole report first and insert it in one call; the
+        # headings are passed as (text, tags) pairs to keep their formatting
         if most_viewed:
-            for item in most_viewed:
-                self.stats_text.insert(tk.END, f"• {item['failure_mode']} (viewed {item['view_count']} times)\n")
+            most_viewed_text = "".join(
+                f"• {item['failure_mode']} (viewed {item['view_count']} times)\n" for item in most_viewed
+            )
         else:
-            self.stats_text.insert(tk.END, "No failure modes have been viewed yet.\n")
+            most_viewed_text = "No failure modes have been viewed yet.\n"
         
-        self.stats_text.insert(tk.END, "\n")
-        
-        # Display recent queries
-        self.stats_text.insert(tk.END, "Recent User Queries:\n", "heading")
         if recent_queries:
-            for query in recent_queries:
-                self.stats_text.insert(tk.END, f"• {query['query']}\n")
+            recent_queries_text = "".join(f"• {query['query']}\n" for query in recent_queries)
         else:
-            self.stats_text.insert(tk.END, "No queries have been made yet.\n")
+            recent_queries_text = "No queries have been made yet.\n"
+        
+        self.stats_text.insert(
+            tk.END,
+            "Most Viewed Failure Modes:\n", "heading",
+            most_viewed_text + "\n", (),
+            "Recent User Queries:\n", "heading",
+            recent_queries_text, ()
+        )
         
         # Apply tag formatting
         self.stats_text.tag_configure("heading", font=("Arial", 12, "bold"))
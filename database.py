@@ -1,99 +1,497 @@
+import queue
 import sqlite3
+import threading
+import time
 import os
-from typing import List, Dict, Any, Tuple
-import json
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# Maximum number of queued writes the background writer commits together
+_WRITE_BATCH_SIZE = 500
+
+# Version of the table layout below, stored in the database's user_version
+_SCHEMA_VERSION = 5
+
+# Table definitions, keyed by table name
+_TABLES = {
+    # Table for tracking user queries
+    'user_queries': """
+        CREATE TABLE IF NOT EXISTS user_queries (
+            id INTEGER PRIMARY KEY,
+            query TEXT NOT NULL,
+            timestamp INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+        )
+        """,
+    # Table for tracking viewed failure modes
+    'viewed_failure_modes': """
+        CREATE TABLE IF NOT EXISTS viewed_failure_modes (
+            id INTEGER PRIMARY KEY,
+            failure_mode TEXT NOT NULL,
+            timestamp INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+        )
+        """,
+    # Running view count per failure mode, kept by _VIEW_COUNT_TRIGGER
+    'failure_mode_counts': """
+        CREATE TABLE IF NOT EXISTS failure_mode_counts (
+            failure_mode TEXT PRIMARY KEY,
+            view_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+    # Table for tracking user feedback on solutions
+    'solution_feedback': """
+        CREATE TABLE IF NOT EXISTS solution_feedback (
+            id INTEGER PRIMARY KEY,
+            failure_mode TEXT NOT NULL,
+            solution_type TEXT NOT NULL,
+            solution_text TEXT NOT NULL,
+            rating INTEGER,
+            comment TEXT,
+            timestamp INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+        )
+        """,
+}
+
+# Bumps failure_mode_counts for every logged view, so the single, batched and
+# background insert paths all keep the counts in step with viewed_failure_modes
+_VIEW_COUNT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trg_vfm_count
+    AFTER INSERT ON viewed_failure_modes
+    BEGIN
+        INSERT INTO failure_mode_counts (failure_mode, view_count)
+        VALUES (NEW.failure_mode, 1)
+        ON CONFLICT (failure_mode) DO UPDATE SET view_count = view_count + 1;
+    END
+    """
+
+# Converts a schema version 0 DATETIME timestamp to Unix epoch seconds;
+# missing timestamps become 0
+_EPOCH_FROM_DATETIME_SQL = """CASE typeof(timestamp)
+    WHEN 'integer' THEN timestamp
+    ELSE COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0)
+    END"""
+
+# SQL statements are kept as module-level constants so every call passes the
+# same string and hits the connection's prepared statement cache. Timestamps
+# are bound from Python so a batch reads the clock once rather than per row
+_INSERT_QUERY_SQL = "INSERT INTO user_queries (query, timestamp) VALUES (?, ?)"
+
+_INSERT_VIEWED_FAILURE_MODE_SQL = "INSERT INTO viewed_failure_modes (failure_mode, timestamp) VALUES (?, ?)"
+
+_INSERT_FEEDBACK_SQL = """INSERT INTO solution_feedback
+   (failure_mode, solution_type, solution_text, rating, comment, timestamp)
+   VALUES (?, ?, ?, ?, ?, ?)"""
+
+# Single-record variants that return the new record's ID from the INSERT itself;
+# the batched and background paths use the plain statements with executemany
+_RETURNING_ID_SQL = {
+    sql: f"{sql} RETURNING id"
+    for sql in (_INSERT_QUERY_SQL, _INSERT_VIEWED_FAILURE_MODE_SQL, _INSERT_FEEDBACK_SQL)
+}
+
+_MOST_VIEWED_SQL = """SELECT failure_mode, view_count
+   FROM failure_mode_counts
+   ORDER BY view_count DESC
+   LIMIT ?"""
+
+_RECENT_QUERIES_SQL = """SELECT id, query, timestamp FROM user_queries
+   ORDER BY timestamp DESC, id DESC
+   LIMIT ?"""
+
+_FEEDBACK_STATS_SQL = """SELECT failure_mode, solution_type, COUNT(*), COUNT(rating), SUM(rating)
+   FROM solution_feedback
+   GROUP BY failure_mode, solution_type"""
+
+def _dict_factory(cursor: sqlite3.Cursor, row: Tuple) -> Dict[str, Any]:
+    """Row factory that returns each row as a dict keyed by column name."""
+    return {column[0]: value for column, value in zip(cursor.description, row)}
 
 class FailureEducatorDatabase:
     """Database manager for the Multi-Agent Failure Educator."""
     
-    def __init__(self, db_path: str = "educator.db"):
+    def __init__(self, db_path: str = "educator.db", auto_commit: bool = True,
+                 background_writes: bool = False):
         """Initialize the database connection.
         
         Args:
             db_path: Path to the SQLite database file.
+            auto_commit: Whether each log call commits immediately. When False,
+                logged records are committed together by flush() or close(),
+                and the report methods only see them once committed.
+            background_writes: Whether log calls only queue their records and
+                return immediately, leaving the inserts and commits to a
+                background writer thread. The writer has its own connection
+                unless the database is in-memory or temporary, which only
+                this instance's connection can reach.
         """
         self.db_path = db_path
+        self.auto_commit = auto_commit
+        self.background_writes = background_writes
         self.conn = None
-        self.cursor = None
+        self.read_conn = None
+        self._write_queue = None
+        self._writer = None
+        # Serialize use of the shared writer and reader connections across
+        # threads; reads only wait for other reads, not for writes
+        self._lock = threading.RLock()
+        self._read_lock = threading.Lock()
+        # Pool key and number of get_database callers holding this instance
+        self._pool_key = None
+        self._pool_refs = 0
         self._connect()
         self._create_tables()
+        if background_writes:
+            self._start_writer()
     
     def _connect(self):
         """Connect to the database."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # Enable dictionary-like access to rows
-        self.cursor = self.conn.cursor()
+        self.conn = self._open_connection()
+        if self._is_private():
+            # A private database is only reachable through its own connection
+            self.read_conn = self.conn
+            self._read_lock = self._lock
+        else:
+            self.read_conn = self._open_read_connection()
     
-    def _create_tables(self):
-        """Create database tables if they don't exist."""
-        # Table for tracking user queries
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS user_queries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            query TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    def _is_private(self) -> bool:
+        """Whether the database is in-memory or temporary.
+        
+        Such a database exists only inside the connection that created it, so
+        every reader and writer has to share self.conn.
+        """
+        return self.db_path in ("", ":memory:")
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection tuned for frequent small writes.
+        
+        Returns:
+            The new connection, in autocommit mode; transactions are opened
+            explicitly where needed.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
         )
-        """)
         
-        # Table for tracking viewed failure modes
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS viewed_failure_modes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            failure_mode TEXT NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        # WAL with synchronous=NORMAL only syncs to disk at checkpoints instead
+        # of on every commit, which is durable enough for interaction logging
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory map
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        return conn
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection for the report queries.
+        
+        With WAL, reads on this connection see the last committed data and
+        never wait on transactions open on the writer connection.
+        
+        Returns:
+            The new read-only connection.
+        """
+        conn = sqlite3.connect(
+            f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False
         )
-        """)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory map
+        return conn
+    
+    def _start_writer(self):
+        """Start the background writer thread."""
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_worker, daemon=True)
+        self._writer.start()
+    
+    def _write_worker(self):
+        """Commit queued writes in batches until a None sentinel arrives.
         
-        # Table for tracking user feedback on solutions
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS solution_feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            failure_mode TEXT NOT NULL,
-            solution_type TEXT NOT NULL,
-            solution_text TEXT NOT NULL,
-            rating INTEGER,
-            comment TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        Each batch holds the first queued write plus whatever else is already
+        waiting, up to _WRITE_BATCH_SIZE, and is committed in one transaction.
+        """
+        if self._is_private():
+            conn, lock = self.conn, self._lock
+        else:
+            conn, lock = self._open_connection(), threading.Lock()
+        try:
+            while True:
+                batch = [self._write_queue.get()]
+                while batch[-1] is not None and len(batch) < _WRITE_BATCH_SIZE:
+                    try:
+                        batch.append(self._write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                writes = [item for item in batch if item is not None]
+                if writes:
+                    with lock:
+                        self._write_batch(conn, writes)
+                
+                for _ in batch:
+                    self._write_queue.task_done()
+                if batch[-1] is None:
+                    break
+        finally:
+            if conn is not self.conn:
+                conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, writes: List[Tuple[str, List[Tuple]]]):
+        """Insert a batch of queued writes and commit them together.
+        
+        Args:
+            conn: The writer connection.
+            writes: (INSERT statement, rows) pairs, in queue order.
+        """
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            for sql, rows in writes:
+                # The savepoint makes a failing write undo all of its own
+                # rows, and only those, without losing the rest of the batch
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    conn.executemany(sql, rows)
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO queued_write")
+                    print(f"Error writing to database: {e}")
+                conn.execute("RELEASE queued_write")
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"Error committing to database: {e}")
+    
+    def _create_tables(self):
+        """Create database tables if they don't exist."""
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version < _SCHEMA_VERSION:
+            self._migrate(version)
+        
+        for create_sql in _TABLES.values():
+            self.conn.execute(create_sql)
+        self.conn.execute(_VIEW_COUNT_TRIGGER)
+        
+        # Indexes backing the report queries
+        # Covers the recent queries report, which reads its rows straight
+        # from the index without touching the table
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queries_ts_covering ON user_queries (timestamp DESC, id DESC, query)"
         )
-        """)
+        # Covers the feedback statistics, which group and sum straight from
+        # the index without touching the table
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_feedback_mode_type_rating "
+            "ON solution_feedback (failure_mode, solution_type, rating)"
+        )
+        
+        # Collect planner statistics the first time so SQLite picks the
+        # indexes; close() keeps them current with PRAGMA optimize
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+            self.conn.execute("ANALYZE")
         
+        self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self.conn.commit()
     
-    def log_user_query(self, query: str) -> int:
+    def _migrate(self, version: int):
+        """Upgrade tables created by an older version of the schema.
+        
+        Args:
+            version: The schema version recorded in the database file.
+        """
+        existing_tables = {
+            row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        
+        self._begin()
+        try:
+            if version < 2:
+                # Version 1 changed timestamps from DATETIME text to INTEGER Unix
+                # epoch seconds; version 2 dropped AUTOINCREMENT from the ids.
+                # Both are applied by rebuilding with the current definitions
+                conversions = {'timestamp': _EPOCH_FROM_DATETIME_SQL} if version < 1 else None
+                for table in _TABLES:
+                    if table in existing_tables:
+                        self._rebuild_table(table, conversions)
+                if 'sqlite_sequence' in existing_tables:
+                    self.conn.execute("DELETE FROM sqlite_sequence")
+            if version < 3:
+                # Version 3 keeps view counts in failure_mode_counts instead of
+                # grouping viewed_failure_modes on every read
+                self.conn.execute(_TABLES['failure_mode_counts'])
+                if 'viewed_failure_modes' in existing_tables:
+                    self.conn.execute(
+                        "INSERT INTO failure_mode_counts (failure_mode, view_count) "
+                        "SELECT failure_mode, COUNT(*) FROM viewed_failure_modes GROUP BY failure_mode"
+                    )
+                self.conn.execute("DROP INDEX IF EXISTS idx_vfm_mode")
+            if version < 4:
+                # Version 4 replaced idx_queries_ts with a covering index
+                self.conn.execute("DROP INDEX IF EXISTS idx_queries_ts")
+            if version < 5:
+                # Version 5 replaced idx_feedback_mode_type with a covering index
+                self.conn.execute("DROP INDEX IF EXISTS idx_feedback_mode_type")
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+    
+    def _rebuild_table(self, table: str, conversions: Dict[str, str] = None):
+        """Recreate a table with its current definition, keeping its rows.
+        
+        Args:
+            table: The name of the table to rebuild.
+            conversions: Optional SQL expressions, keyed by column name, that
+                compute a column's new value from the old row.
+        """
+        conversions = conversions or {}
+        self.conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        self.conn.execute(_TABLES[table])
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        values = [conversions.get(column, column) for column in columns]
+        self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(values)} FROM {table}_old"
+        )
+        self.conn.execute(f"DROP TABLE {table}_old")
+    
+    def _check_open(self, conn: sqlite3.Connection):
+        """Raise sqlite3's closed database error if close() has been called.
+        
+        Args:
+            conn: The connection about to be used.
+        """
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+    
+    def _begin(self):
+        """Open a transaction unless one is already in progress."""
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+    
+    def _insert(self, sql: str, params: Tuple) -> Optional[int]:
+        """Insert a single record, committing it if auto-commit is enabled.
+        
+        Args:
+            sql: The INSERT statement.
+            params: The values to bind.
+            
+        Returns:
+            The ID of the inserted record, or None if the record was queued
+            for the background writer.
+        """
+        if self._writer is not None:
+            self._write_queue.put((sql, [params]))
+            return None
+        
+        with self._lock:
+            self._check_open(self.conn)
+            self._begin()
+            try:
+                (record_id,) = self.conn.execute(_RETURNING_ID_SQL[sql], params).fetchone()
+            except sqlite3.Error:
+                if self.auto_commit:
+                    self.conn.rollback()
+                raise
+            if self.auto_commit:
+                self.conn.commit()
+            return record_id
+    
+    def _insert_many(self, sql: str, rows: List[Tuple]) -> int:
+        """Insert several records in one transaction.
+        
+        Args:
+            sql: The INSERT statement.
+            rows: The values to bind, one tuple per record.
+            
+        Returns:
+            The number of inserted (or queued) records.
+        """
+        if self._writer is not None:
+            rows = list(rows)
+            self._write_queue.put((sql, rows))
+            return len(rows)
+        
+        with self._lock:
+            self._check_open(self.conn)
+            self._begin()
+            try:
+                cursor = self.conn.executemany(sql, rows)
+            except sqlite3.Error:
+                if self.auto_commit:
+                    self.conn.rollback()
+                raise
+            if self.auto_commit:
+                self.conn.commit()
+            return cursor.rowcount
+    
+    def log_user_query(self, query: str) -> Optional[int]:
         """Log a user query to the database.
         
         Args:
             query: The user's query text.
             
         Returns:
-            The ID of the inserted record.
+            The ID of the inserted record, or None with background writes.
         """
-        self.cursor.execute(
-            "INSERT INTO user_queries (query) VALUES (?)",
-            (query,)
+        return self._insert(
+            _INSERT_QUERY_SQL,
+            (query, int(time.time()))
+        )
+    
+    def log_user_queries(self, queries: List[str]) -> int:
+        """Log several user queries in a single transaction.
+        
+        Args:
+            queries: The users' query texts.
+            
+        Returns:
+            The number of inserted records.
+        """
+        now = int(time.time())
+        return self._insert_many(
+            _INSERT_QUERY_SQL,
+            [(query, now) for query in queries]
         )
-        self.conn.commit()
-        return self.cursor.lastrowid
     
-    def log_viewed_failure_mode(self, failure_mode: str) -> int:
+    def log_viewed_failure_mode(self, failure_mode: str) -> Optional[int]:
         """Log a viewed failure mode to the database.
         
         Args:
             failure_mode: The name of the viewed failure mode.
             
         Returns:
-            The ID of the inserted record.
+            The ID of the inserted record, or None with background writes.
         """
-        self.cursor.execute(
-            "INSERT INTO viewed_failure_modes (failure_mode) VALUES (?)",
-            (failure_mode,)
+        return self._insert(
+            _INSERT_VIEWED_FAILURE_MODE_SQL,
+            (failure_mode, int(time.time()))
+        )
+    
+    def log_viewed_failure_modes(self, failure_modes: List[str]) -> int:
+        """Log several viewed failure modes in a single transaction.
+        
+        Args:
+            failure_modes: The names of the viewed failure modes.
+            
+        Returns:
+            The number of inserted records.
+        """
+        now = int(time.time())
+        return self._insert_many(
+            _INSERT_VIEWED_FAILURE_MODE_SQL,
+            [(failure_mode, now) for failure_mode in failure_modes]
         )
-        self.conn.commit()
-        return self.cursor.lastrowid
     
     def log_solution_feedback(self, failure_mode: str, solution_type: str, 
                              solution_text: str, rating: int = None, 
-                             comment: str = None) -> int:
+                             comment: str = None) -> Optional[int]:
         """Log user feedback on a solution.
         
         Args:
@@ -104,16 +502,59 @@ class FailureEducatorDatabase:
             comment: Optional user comment.
             
         Returns:
-            The ID of the inserted record.
+            The ID of the inserted record, or None with background writes.
         """
-        self.cursor.execute(
-            """INSERT INTO solution_feedback 
-               (failure_mode, solution_type, solution_text, rating, comment) 
-               VALUES (?, ?, ?, ?, ?)""",
-            (failure_mode, solution_type, solution_text, rating, comment)
+        return self._insert(
+            _INSERT_FEEDBACK_SQL,
+            (failure_mode, solution_type, solution_text, rating, comment, int(time.time()))
         )
-        self.conn.commit()
-        return self.cursor.lastrowid
+    
+    def log_solution_feedbacks(self, feedback: List[Tuple]) -> int:
+        """Log several pieces of solution feedback in a single transaction.
+        
+        Args:
+            feedback: Tuples of (failure_mode, solution_type, solution_text,
+                rating, comment), as accepted by log_solution_feedback.
+            
+        Returns:
+            The number of inserted records.
+        """
+        now = int(time.time())
+        return self._insert_many(
+            _INSERT_FEEDBACK_SQL,
+            [(*entry, now) for entry in feedback]
+        )
+    
+    def flush(self):
+        """Commit any records logged since the last commit.
+        
+        With background writes, this waits until the writer has committed
+        everything queued so far.
+        """
+        if self._writer is not None:
+            self._write_queue.join()
+        with self._lock:
+            self._check_open(self.conn)
+            if self.conn.in_transaction:
+                self.conn.commit()
+    
+    def _fetch_dicts(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Run a report query on the read connection.
+        
+        Args:
+            sql: The SELECT statement.
+            params: The values to bind.
+            
+        Returns:
+            The result rows as dictionaries keyed by column name.
+        """
+        with self._read_lock:
+            self._check_open(self.read_conn)
+            # The row factory is set on the cursor rather than the connection,
+            # which may be shared with the writer for in-memory databases
+            cursor = self.read_conn.cursor()
+            cursor.row_factory = _dict_factory
+            return cursor.execute(sql, params).fetchall()
     
     def get_most_viewed_failure_modes(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get the most frequently viewed failure modes.
@@ -124,15 +565,7 @@ class FailureEducatorDatabase:
         Returns:
             List of dictionaries containing failure mode names and view counts.
         """
-        self.cursor.execute(
-            """SELECT failure_mode, COUNT(*) as view_count 
-               FROM viewed_failure_modes 
-               GROUP BY failure_mode 
-               ORDER BY view_count DESC 
-               LIMIT ?""",
-            (limit,)
-        )
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._fetch_dicts(_MOST_VIEWED_SQL, (limit,))
     
     def get_recent_queries(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent user queries.
@@ -143,13 +576,7 @@ class FailureEducatorDatabase:
         Returns:
             List of dictionaries containing query data.
         """
-        self.cursor.execute(
-            """SELECT * FROM user_queries 
-               ORDER BY timestamp DESC 
-               LIMIT ?""",
-            (limit,)
-        )
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._fetch_dicts(_RECENT_QUERIES_SQL, (limit,))
     
     def get_solution_feedback_stats(self) -> Dict[str, Any]:
         """Get statistics on solution feedback.
@@ -157,22 +584,25 @@ class FailureEducatorDatabase:
         Returns:
             Dictionary with feedback statistics.
         """
-        # Get average ratings by solution type
-        self.cursor.execute(
-            """SELECT solution_type, AVG(rating) as avg_rating 
-               FROM solution_feedback 
-               WHERE rating IS NOT NULL 
-               GROUP BY solution_type"""
-        )
-        avg_ratings_by_type = {row['solution_type']: row['avg_rating'] for row in self.cursor.fetchall()}
+        # Aggregate per (failure mode, solution type) in a single scan and
+        # roll the groups up into both statistics
+        with self._read_lock:
+            self._check_open(self.read_conn)
+            rows = self.read_conn.execute(_FEEDBACK_STATS_SQL).fetchall()
         
-        # Get count of feedback by failure mode
-        self.cursor.execute(
-            """SELECT failure_mode, COUNT(*) as feedback_count 
-               FROM solution_feedback 
-               GROUP BY failure_mode"""
-        )
-        feedback_count_by_mode = {row['failure_mode']: row['feedback_count'] for row in self.cursor.fetchall()}
+        feedback_count_by_mode = {}
+        rating_totals_by_type = {}
+        for failure_mode, solution_type, feedback_count, rating_count, rating_sum in rows:
+            feedback_count_by_mode[failure_mode] = feedback_count_by_mode.get(failure_mode, 0) + feedback_count
+            if rating_count:
+                totals = rating_totals_by_type.setdefault(solution_type, [0, 0])
+                totals[0] += rating_count
+                totals[1] += rating_sum
+        
+        avg_ratings_by_type = {
+            solution_type: rating_sum / rating_count
+            for solution_type, (rating_count, rating_sum) in sorted(rating_totals_by_type.items())
+        }
         
         return {
             'avg_ratings_by_type': avg_ratings_by_type,
@@ -180,6 +610,74 @@ class FailureEducatorDatabase:
         }
     
     def close(self):
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
+        """Commit pending records and close the database connection.
+        
+        For an instance shared through get_database, each call releases one
+        get_database reference, and the connection is only closed once the
+        last holder has called close().
+        """
+        with _pool_lock:
+            if self._pool_key is not None:
+                self._pool_refs -= 1
+                if self._pool_refs > 0:
+                    return
+                del _pool[self._pool_key]
+                self._pool_key = None
+        
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._read_lock:
+            if self.read_conn is not None and self.read_conn is not self.conn:
+                self.read_conn.close()
+            self.read_conn = None
+        with self._lock:
+            if self.conn:
+                self.flush()
+                self.conn.execute("PRAGMA optimize")
+                self.conn.close()
+                self.conn = None
+
+
+# Shared database instances, keyed by database path
+_pool: Dict[str, FailureEducatorDatabase] = {}
+_pool_lock = threading.Lock()
+
+
+def get_database(db_path: str = "educator.db", **kwargs) -> FailureEducatorDatabase:
+    """Get the shared database instance for a path, creating it on first use.
+    
+    Reusing one instance avoids reopening the SQLite connection and re-running
+    the schema setup for every caller. Each call takes a reference that the
+    caller releases with close().
+    
+    Args:
+        db_path: Path to the SQLite database file.
+        **kwargs: Options passed to FailureEducatorDatabase when the instance
+            is first created. Later calls for the same path must pass the same
+            values for any options they give.
+        
+    Returns:
+        The shared FailureEducatorDatabase for db_path.
+        
+    Raises:
+        ValueError: If kwargs conflict with the existing instance's options.
+    """
+    key = db_path if db_path in ("", ":memory:") else os.path.abspath(db_path)
+    with _pool_lock:
+        db = _pool.get(key)
+        if db is None:
+            db = _pool[key] = FailureEducatorDatabase(db_path, **kwargs)
+            db._pool_key = key
+        else:
+            conflicts = {
+                name: value for name, value in kwargs.items()
+                if getattr(db, name, None) != value
+            }
+            if conflicts:
+                raise ValueError(
+                    f"Database {db_path!r} is already open with different options: {conflicts}"
+                )
+        db._pool_refs += 1
+        return db